@@ -0,0 +1,141 @@
+"""In-process LRU cache for chat completion responses.
+
+Identical prompts show up constantly in demos, evals, and ablations;
+caching turns a repeat call from ~1s of network latency and paid tokens
+into an O(1) dict lookup. Keys are a sha256 over the request parameters
+that change the output (model, temperature, messages).
+
+An optional diskcache backend persists responses across runs; enable it
+with enable_disk_cache().
+"""
+
+from collections import OrderedDict
+import hashlib
+import orjson
+from typing import Any, Dict, List, Optional
+
+from demos._client import create_chat_completion
+
+MAXSIZE = 1000
+
+_CACHE: "OrderedDict[str, Any]" = OrderedDict()
+
+_DISK_CACHE: Optional[Any] = None
+
+
+def make_cache_key(
+    model: str,
+    temperature: float,
+    messages: List[Dict[str, Any]],
+    **kwargs: Any,
+) -> str:
+    """
+    Build a stable cache key from the request parameters that affect the output.
+
+    Every remaining request argument (response_format, max_tokens, stop, ...)
+    is hashed too: identical messages sent with, say, different enum-constrained
+    schemas are different requests and must not share a cache entry.
+
+    Args:
+        model (str): OpenAI model name
+        temperature (float): Sampling temperature
+        messages (List[Dict[str, Any]]): Chat messages for the request
+        **kwargs: Remaining request arguments
+
+    Returns:
+        str: Hex sha256 digest usable as a dict key
+    """
+    payload = orjson.dumps(
+        {"m": model, "t": temperature, "msgs": messages, "kw": kwargs},
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def enable_disk_cache(directory: str = ".cache") -> None:
+    """
+    Persist cached responses across runs using diskcache.
+
+    Args:
+        directory (str): Directory for the diskcache store (default: ".cache")
+
+    Raises:
+        ImportError: If diskcache is not installed
+    """
+    global _DISK_CACHE
+    import diskcache
+
+    _DISK_CACHE = diskcache.Cache(directory)
+
+
+def cache_get(key: str) -> Optional[Any]:
+    """Return the cached response for key, or None on a miss."""
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    if _DISK_CACHE is not None and key in _DISK_CACHE:
+        value = _DISK_CACHE[key]
+        # Promote disk hits into the in-memory cache
+        cache_put(key, value)
+        return value
+
+    return None
+
+
+def cache_put(key: str, value: Any) -> None:
+    """Store a response under key, evicting the least recently used entry if full."""
+    _CACHE[key] = value
+    _CACHE.move_to_end(key)
+    if len(_CACHE) > MAXSIZE:
+        _CACHE.popitem(last=False)
+
+    if _DISK_CACHE is not None:
+        _DISK_CACHE[key] = value
+
+
+def cached_chat_completion(
+    client: Any,
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: float,
+    use_cache: Optional[bool] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Call client.chat.completions.create with the LRU cache in front.
+
+    By default caching only applies to deterministic requests
+    (temperature == 0); pass use_cache=True to opt in for sampled
+    requests, or use_cache=False to bypass the cache entirely.
+
+    Args:
+        client: OpenAI client to call on a cache miss
+        model (str): OpenAI model name
+        messages (List[Dict[str, Any]]): Chat messages for the request
+        temperature (float): Sampling temperature
+        use_cache (Optional[bool]): Override the temperature-based default
+        **kwargs: Remaining arguments passed through to create()
+
+    Returns:
+        The chat completion response (cached or fresh)
+    """
+    if use_cache is None:
+        use_cache = temperature == 0
+
+    if not use_cache:
+        return create_chat_completion(
+            client, model=model, messages=messages, temperature=temperature, **kwargs
+        )
+
+    key = make_cache_key(model, temperature, messages, **kwargs)
+
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
+    response = create_chat_completion(
+        client, model=model, messages=messages, temperature=temperature, **kwargs
+    )
+    cache_put(key, response)
+    return response
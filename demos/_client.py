@@ -0,0 +1,91 @@
+"""Shared OpenAI client construction and rate-limit-aware request helpers.
+
+Building a fresh OpenAI() per call recreates the httpx connection pool,
+so every request pays a new TCP/TLS handshake. These helpers memoize one
+client per API key; repeat calls reuse pooled keep-alive connections.
+
+The create wrappers retry transient rate-limit, timeout, and connection
+errors with exponential backoff, so a burst of concurrent calls degrades
+into short delays instead of hard 429 failures.
+"""
+
+import functools
+import os
+from typing import Any, Optional
+
+import httpx
+import openai
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+)
+
+
+_DEFAULT_API_KEY: Optional[str] = None
+
+
+def default_api_key() -> Optional[str]:
+    """Resolve OPENAI_API_KEY, memoizing only a successful lookup.
+
+    load_dotenv walks the filesystem and parses .env, which is milliseconds of
+    overhead when repeated on every call; after the first hit, repeat lookups
+    are a plain attribute read. Misses are not cached, so setting the env var
+    later in the process (e.g. in a notebook) is picked up on the next call.
+    Returns None when the key is unset so callers can raise their own
+    ValueError.
+    """
+    global _DEFAULT_API_KEY
+    if _DEFAULT_API_KEY is None:
+        load_dotenv()
+        _DEFAULT_API_KEY = os.getenv("OPENAI_API_KEY")
+    return _DEFAULT_API_KEY
+
+
+@functools.lru_cache(maxsize=4)
+def get_client(api_key: str) -> OpenAI:
+    """Return a shared synchronous OpenAI client for this API key."""
+    return OpenAI(
+        api_key=api_key,
+        http_client=httpx.Client(limits=_LIMITS),
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def get_async_client(api_key: str) -> AsyncOpenAI:
+    """Return a shared asynchronous OpenAI client for this API key."""
+    return AsyncOpenAI(
+        api_key=api_key,
+        http_client=httpx.AsyncClient(limits=_LIMITS),
+    )
+
+
+@retry(
+    retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+    wait=wait_random_exponential(multiplier=1, max=60),
+    stop=stop_after_attempt(6),
+)
+def create_chat_completion(client: OpenAI, **kwargs: Any) -> Any:
+    """Call the chat completions endpoint with exponential-backoff retries."""
+    return client.chat.completions.create(**kwargs)
+
+
+@retry(
+    retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+    wait=wait_random_exponential(multiplier=1, max=60),
+    stop=stop_after_attempt(6),
+)
+async def acreate_chat_completion(client: AsyncOpenAI, **kwargs: Any) -> Any:
+    """Call the async chat completions endpoint with exponential-backoff retries."""
+    return await client.chat.completions.create(**kwargs)
@@ -0,0 +1,104 @@
+"""Local token counting and truncation with tiktoken.
+
+The entry points cap the completion with max_tokens but never check the
+prompt side, so an oversized input costs a full network round trip just
+to come back as a context-length error. Encoding locally takes tens of
+microseconds per call (tiktoken's core is compiled), which is cheap
+enough to count every prompt up front: oversized inputs get truncated on
+a token boundary before the request is sent, and callers get the prompt
+token count without waiting for the response's usage block.
+"""
+
+import functools
+from typing import Tuple
+
+import tiktoken
+
+# Context window of the gpt-4o family; every model the demos default to
+# accepts at least this many tokens
+DEFAULT_CONTEXT_LIMIT = 128_000
+
+
+@functools.lru_cache(maxsize=8)
+def get_encoding(model: str) -> "tiktoken.Encoding":
+    """
+    Return (and memoize) the tokenizer for a model.
+
+    Building an encoding loads its vocabulary from disk, so this is cached
+    per model name rather than rebuilt on every call.
+
+    Args:
+        model (str): OpenAI model name
+
+    Returns:
+        tiktoken.Encoding: The model's tokenizer
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Model names tiktoken does not know yet fall back to the gpt-4o
+        # tokenizer, which all the demos' default models use
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens text encodes to under model's tokenizer.
+
+    Args:
+        text (str): The text to count
+        model (str): OpenAI model name (selects the tokenizer)
+
+    Returns:
+        int: Number of tokens
+    """
+    return len(get_encoding(model).encode(text))
+
+
+def fit_text_to_context(
+    text: str,
+    static_prompt: str,
+    model: str,
+    max_tokens: int,
+    context_limit: int = DEFAULT_CONTEXT_LIMIT,
+) -> Tuple[str, int]:
+    """
+    Truncate the variable text so the prompt plus the completion fit the
+    model's context window.
+
+    The static prompt (system message plus user template) is counted as-is;
+    whatever budget remains after reserving max_tokens for the completion
+    goes to the variable text, which is truncated by decoding the trimmed
+    token list so the cut always lands on a token boundary.
+
+    Args:
+        text (str): The variable text being sent
+        static_prompt (str): The fixed prompt text sent alongside it
+        model (str): OpenAI model name (selects the tokenizer)
+        max_tokens (int): Completion budget reserved for the response
+        context_limit (int): The model's context window size
+
+    Returns:
+        Tuple[str, int]: The (possibly truncated) text and the prompt token
+                         count actually being sent
+
+    Raises:
+        ValueError: If the static prompt alone leaves no room for input
+    """
+    encoding = get_encoding(model)
+
+    static_tokens = len(encoding.encode(static_prompt))
+    budget = context_limit - max_tokens - static_tokens
+    if budget <= 0:
+        raise ValueError(
+            f"static prompt ({static_tokens} tokens) plus max_tokens "
+            f"({max_tokens}) leaves no room for input within the "
+            f"{context_limit}-token context window"
+        )
+
+    text_tokens = encoding.encode(text)
+    if len(text_tokens) > budget:
+        text_tokens = text_tokens[:budget]
+        text = encoding.decode(text_tokens)
+
+    return text, static_tokens + len(text_tokens)
@@ -0,0 +1,118 @@
+"""Columnar (structure-of-arrays) views of batch results.
+
+The batch paths accumulate one small dict per input, which is convenient
+to print but heavy to analyze: every dict repeats the same keys and adds
+~300B of overhead, and downstream group-bys or histograms have to walk
+Python objects. These helpers pivot the results into a dict of parallel
+column lists, and optionally into a pyarrow.Table for vectorized
+analytics or parquet export.
+
+pyarrow is imported lazily so the demos keep working without it.
+"""
+
+from typing import Dict, Any, List
+
+
+def classification_results_to_columns(
+    results: List[Dict[str, Any]],
+) -> Dict[str, List[Any]]:
+    """
+    Pivot classification results (from classify_texts_batch or
+    classify_product_items_batch) into parallel columns.
+
+    Args:
+        results (List[Dict[str, Any]]): Per-item result dicts, in input order
+
+    Returns:
+        Dict[str, List[Any]]: Columns input_text, classification, confidence,
+                              reasoning, model, and error, each len(results) long.
+                              input_text is only populated when the batch was run
+                              with return_inputs=True
+    """
+    n = len(results)
+    columns: Dict[str, List[Any]] = {
+        "input_text": [None] * n,
+        "classification": [None] * n,
+        "confidence": [None] * n,
+        "reasoning": [None] * n,
+        "model": [None] * n,
+        "error": [None] * n,
+    }
+
+    for i, result in enumerate(results):
+        columns["input_text"][i] = result.get("input_text") or result.get(
+            "product_item_name"
+        )
+        columns["classification"][i] = result.get("classification") or result.get(
+            "predicted_category"
+        )
+        columns["confidence"][i] = result.get("confidence")
+        columns["reasoning"][i] = result.get("reasoning")
+        columns["model"][i] = result.get("model_used")
+        columns["error"][i] = result.get("error")
+
+    return columns
+
+
+def entity_results_to_columns(
+    results: List[Dict[str, Any]],
+) -> Dict[str, List[Any]]:
+    """
+    Flatten entity extraction results (from extract_entities_batch) into one
+    row per extracted entity.
+
+    Args:
+        results (List[Dict[str, Any]]): Per-text result dicts, in input order
+
+    Returns:
+        Dict[str, List[Any]]: Columns doc_id, entity_type, entity_name, and
+                              entity_description, one entry per entity
+    """
+    columns: Dict[str, List[Any]] = {
+        "doc_id": [],
+        "entity_type": [],
+        "entity_name": [],
+        "entity_description": [],
+    }
+
+    for doc_id, result in enumerate(results):
+        entities = result.get("extracted_entities", {}).get("entities", [])
+        for entity in entities:
+            columns["doc_id"].append(doc_id)
+            columns["entity_type"].append(entity.get("predicted_entity_type"))
+            columns["entity_name"].append(entity.get("predicted_entity_name"))
+            columns["entity_description"].append(
+                entity.get("predicted_entity_description")
+            )
+
+    return columns
+
+
+def to_arrow_table(columns: Dict[str, List[Any]]) -> Any:
+    """
+    Convert a column dict into a pyarrow.Table for vectorized analytics or
+    parquet export.
+
+    Low-cardinality label columns (classification, entity_type) are
+    dictionary-encoded, which cuts their memory several-fold versus
+    per-row Python strings.
+
+    Args:
+        columns (Dict[str, List[Any]]): Columns from one of the *_to_columns helpers
+
+    Returns:
+        pyarrow.Table: The columnar table
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+
+    arrays = {}
+    for name, values in columns.items():
+        array = pa.array(values)
+        if name in ("classification", "entity_type"):
+            array = array.dictionary_encode()
+        arrays[name] = array
+
+    return pa.table(arrays)
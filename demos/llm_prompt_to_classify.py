@@ -1,18 +1,140 @@
-import json
-import os
-from typing import Dict, Any, Optional, List
+import functools
+import orjson
+import re
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 import openai
-from openai import OpenAI
+
+from demos._cache import cached_chat_completion
+from demos._client import create_chat_completion, default_api_key, get_client
+from demos._tokens import fit_text_to_context
+
+
+# Fixed prefix of the user message; counted as part of the static prompt
+# when budgeting tokens
+_CLASSIFY_USER_PREFIX = "Please classify the following text:\n\n"
+
+
+@functools.lru_cache(maxsize=128)
+def _default_system_prompt(classification_categories: Tuple[str, ...]) -> str:
+    """Build (and memoize) the default classification system prompt for a category set."""
+    return f"""You are a text classification expert. Your task is to classify the given text into one of the following categories: {", ".join(classification_categories)}.
+
+Please respond with a JSON object containing:
+- "classification": the chosen category
+- "confidence": a confidence score between 0 and 1
+- "reasoning": a brief explanation of why this classification was chosen
+- "alternative_categories": list of other categories that could apply (if any)
+
+Example response format:
+{{
+    "classification": "category_name",
+    "confidence": 0.85,
+    "reasoning": "Brief explanation of the classification decision",
+    "alternative_categories": ["other_category1", "other_category2"]
+}}"""
+
+
+@functools.lru_cache(maxsize=128)
+def _batch_system_prompt(classification_categories: Tuple[str, ...]) -> str:
+    """Build (and memoize) the batched classification system prompt for a category set."""
+    return f"""You are a text classification expert. Your task is to classify each of the given texts into one of the following categories: {", ".join(classification_categories)}.
+
+Please respond with a JSON object containing a "results" list with one entry per input item:
+{{
+    "results": [
+        {{
+            "id": 1,
+            "classification": "category_name",
+            "confidence": 0.85,
+            "reasoning": "Brief explanation of the classification decision",
+            "alternative_categories": ["other_category1", "other_category2"]
+        }}
+    ]
+}}
+
+The "id" field must match the number of the input item."""
+
+
+@functools.lru_cache(maxsize=128)
+def _classification_response_format(
+    classification_categories: Tuple[str, ...],
+) -> Dict[str, Any]:
+    """Build (and memoize) the strict response schema for a category set.
+
+    The enum constraint forces the model to pick an allowed category, and
+    strict mode guarantees schema-valid JSON server-side, so parsing the
+    response can never fail.
+    """
+    categories = list(classification_categories)
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "Classification",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "required": [
+                    "classification",
+                    "confidence",
+                    "reasoning",
+                    "alternative_categories",
+                ],
+                "properties": {
+                    "classification": {"type": "string", "enum": categories},
+                    "confidence": {"type": "number"},
+                    "reasoning": {"type": "string"},
+                    "alternative_categories": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": categories},
+                    },
+                },
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+@functools.lru_cache(maxsize=128)
+def _batch_classification_response_format(
+    classification_categories: Tuple[str, ...],
+) -> Dict[str, Any]:
+    """Build (and memoize) the strict response schema for batched classification."""
+    item_schema = _classification_response_format(classification_categories)[
+        "json_schema"
+    ]["schema"]
+    entry_schema = {
+        "type": "object",
+        "required": ["id"] + item_schema["required"],
+        "properties": {"id": {"type": "integer"}, **item_schema["properties"]},
+        "additionalProperties": False,
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "ClassificationBatch",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "required": ["results"],
+                "properties": {
+                    "results": {"type": "array", "items": entry_schema},
+                },
+                "additionalProperties": False,
+            },
+        },
+    }
 
 
 def classify_text_with_openai(
     text_to_classify: str,
     classification_categories: List[str],
     system_prompt: Optional[str] = None,
-    model: str = "gpt-3.5-turbo",
+    model: str = "gpt-4o-mini",
     temperature: float = 0.1,
-    max_tokens: int = 1000,
+    max_tokens: int = 200,
     api_key: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    return_inputs: bool = False,
 ) -> Dict[str, Any]:
     """
     Classify text using OpenAI's API and return results as JSON.
@@ -21,10 +143,15 @@ def classify_text_with_openai(
         text_to_classify (str): The text to be classified
         classification_categories (List[str]): List of possible classification categories
         system_prompt (Optional[str]): Custom system prompt. If None, uses default
-        model (str): OpenAI model to use (default: "gpt-3.5-turbo")
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
         temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
         max_tokens (int): Maximum number of tokens in response
         api_key (Optional[str]): OpenAI API key. If None, uses environment variable
+        use_cache (Optional[bool]): Cache responses for repeat prompts. Defaults to
+                                    caching only when temperature == 0
+        return_inputs (bool): Echo the input text and category list back in the
+                              result. Off by default to avoid duplicating the
+                              input corpus in batch runs
 
     Returns:
         Dict[str, Any]: JSON response with classification results
@@ -42,95 +169,316 @@ def classify_text_with_openai(
         raise ValueError("classification_categories cannot be empty")
 
     # Get API key
-    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    api_key = api_key or default_api_key()
     if not api_key:
         raise ValueError(
             "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter"
         )
 
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    # Reuse the shared client so requests reuse pooled connections
+    client = get_client(api_key)
 
-    # Create default system prompt if none provided
+    # Create default system prompt if none provided (memoized per category set)
     if system_prompt is None:
-        system_prompt = f"""You are a text classification expert. Your task is to classify the given text into one of the following categories: {", ".join(classification_categories)}.
-
-Please respond with a JSON object containing:
-- "classification": the chosen category
-- "confidence": a confidence score between 0 and 1
-- "reasoning": a brief explanation of why this classification was chosen
-- "alternative_categories": list of other categories that could apply (if any)
+        system_prompt = _default_system_prompt(tuple(classification_categories))
 
-Example response format:
-{{
-    "classification": "category_name",
-    "confidence": 0.85,
-    "reasoning": "Brief explanation of the classification decision",
-    "alternative_categories": ["other_category1", "other_category2"]
-}}"""
+    # Count the prompt locally and truncate oversized inputs up front rather
+    # than paying a round trip for a context-length error
+    text_to_classify, prompt_tokens = fit_text_to_context(
+        text_to_classify, system_prompt + _CLASSIFY_USER_PREFIX, model, max_tokens
+    )
 
     # Create the user message
-    user_message = f"Please classify the following text:\n\n{text_to_classify}"
+    user_message = _CLASSIFY_USER_PREFIX + text_to_classify
 
     try:
-        # Make API call
-        response = client.chat.completions.create(
+        # Make API call (served from the LRU cache on repeat prompts)
+        response = cached_chat_completion(
+            client,
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message},
             ],
             temperature=temperature,
+            use_cache=use_cache,
             max_tokens=max_tokens,
-            response_format={"type": "json_object"},
+            stop=["\n\n\n"],
+            response_format=_classification_response_format(
+                tuple(classification_categories)
+            ),
         )
 
-        # Extract and parse the response
+        # Extract and parse the response (schema-valid by construction)
         response_content = response.choices[0].message.content
-
-        # Parse JSON response
-        try:
-            result = json.loads(response_content)
-
-            # Add metadata to the response
-            result.update(
-                {
-                    "input_text": text_to_classify,
-                    "available_categories": classification_categories,
-                    "model_used": model,
-                    "tokens_used": response.usage.total_tokens
-                    if response.usage
-                    else None,
-                }
-            )
-
-            return result
-
-        except json.JSONDecodeError as e:
-            # If JSON parsing fails, return a structured error response
-            return {
-                "error": "Failed to parse JSON response from OpenAI",
-                "raw_response": response_content,
-                "json_error": str(e),
-                "input_text": text_to_classify,
-                "available_categories": classification_categories,
+        result = orjson.loads(response_content)
+
+        # Add metadata to the response
+        result.update(
+            {
+                "model_used": model,
+                "prompt_tokens": prompt_tokens,
+                "tokens_used": response.usage.total_tokens
+                if response.usage
+                else None,
             }
+        )
+        if return_inputs:
+            result["input_text"] = text_to_classify
+            result["available_categories"] = classification_categories
+
+        return result
 
     except openai.OpenAIError as e:
         # Handle OpenAI API errors
-        return {
-            "error": f"OpenAI API error: {str(e)}",
-            "input_text": text_to_classify,
-            "available_categories": classification_categories,
-        }
+        return {"error": f"OpenAI API error: {str(e)}"}
 
     except Exception as e:
         # Handle any other unexpected errors
-        return {
-            "error": f"Unexpected error: {str(e)}",
-            "input_text": text_to_classify,
-            "available_categories": classification_categories,
-        }
+        return {"error": f"Unexpected error: {str(e)}"}
+
+
+# Matches a completed top-level string or number field in the streamed JSON.
+# A number only counts as complete once a delimiter follows it in the buffer;
+# otherwise a chunk boundary could split a value (e.g. "0.8" then "5") and the
+# truncated prefix would be yielded as final
+_STREAM_FIELD_RE = re.compile(
+    r'"(classification|confidence|reasoning)"\s*:\s*'
+    r'("(?:[^"\\]|\\.)*"|-?[0-9.eE+]+(?=[,}\s]))'
+)
+
+
+def classify_text_stream(
+    text_to_classify: str,
+    classification_categories: List[str],
+    system_prompt: Optional[str] = None,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 200,
+    api_key: Optional[str] = None,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Classify text with a streamed response, yielding fields as they complete.
+
+    Instead of blocking until the full response is generated, this yields
+    ("classification", value) as soon as that field closes in the streamed
+    JSON — typically around first-token latency rather than full-generation
+    latency — followed by "confidence" and "reasoning" as they arrive, and
+    finally ("result", full_dict) once the stream ends.
+
+    Args:
+        text_to_classify (str): The text to be classified
+        classification_categories (List[str]): List of possible classification categories
+        system_prompt (Optional[str]): Custom system prompt. If None, uses default
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
+        temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
+        max_tokens (int): Maximum number of tokens in response
+        api_key (Optional[str]): OpenAI API key. If None, uses environment variable
+
+    Yields:
+        Tuple[str, Any]: (field_name, value) pairs, ending with ("result", dict).
+                         On API failure a single ("error", message) is yielded
+
+    Raises:
+        ValueError: If required parameters are missing
+    """
+
+    # Validate inputs
+    if not text_to_classify.strip():
+        raise ValueError("text_to_classify cannot be empty")
+
+    if not classification_categories:
+        raise ValueError("classification_categories cannot be empty")
+
+    # Get API key
+    api_key = api_key or default_api_key()
+    if not api_key:
+        raise ValueError(
+            "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter"
+        )
+
+    # Reuse the shared client so requests reuse pooled connections
+    client = get_client(api_key)
+
+    # Create default system prompt if none provided (memoized per category set)
+    if system_prompt is None:
+        system_prompt = _default_system_prompt(tuple(classification_categories))
+
+    # Count the prompt locally and truncate oversized inputs up front rather
+    # than paying a round trip for a context-length error
+    text_to_classify, prompt_tokens = fit_text_to_context(
+        text_to_classify, system_prompt + _CLASSIFY_USER_PREFIX, model, max_tokens
+    )
+
+    user_message = _CLASSIFY_USER_PREFIX + text_to_classify
+
+    try:
+        stream = create_chat_completion(
+            client,
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stop=["\n\n\n"],
+            response_format=_classification_response_format(
+                tuple(classification_categories)
+            ),
+            stream=True,
+        )
+
+        buffer = ""
+        yielded = set()
+
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+
+            buffer += chunk.choices[0].delta.content or ""
+
+            # Surface each scalar field as soon as its value is complete
+            for match in _STREAM_FIELD_RE.finditer(buffer):
+                field = match.group(1)
+                if field not in yielded:
+                    yielded.add(field)
+                    yield field, orjson.loads(match.group(2))
+
+        # Full response plus metadata; the stream can still end mid-JSON if
+        # generation hits max_tokens or the stop sequence
+        try:
+            result = orjson.loads(buffer)
+        except orjson.JSONDecodeError as e:
+            yield "error", f"Incomplete streamed response: {str(e)}"
+            return
+
+        result["model_used"] = model
+        result["prompt_tokens"] = prompt_tokens
+        yield "result", result
+
+    except openai.OpenAIError as e:
+        yield "error", f"OpenAI API error: {str(e)}"
+
+
+def classify_texts_batch(
+    texts_to_classify: List[str],
+    classification_categories: List[str],
+    batch_size: int = 20,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 1000,
+    api_key: Optional[str] = None,
+    return_inputs: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Classify many texts with a single API call per batch instead of one call per text.
+
+    The category list and instructions are sent once per batch, so the per-item
+    token cost and wall time shrink roughly in proportion to batch_size.
+
+    Args:
+        texts_to_classify (List[str]): The texts to be classified
+        classification_categories (List[str]): List of possible classification categories
+        batch_size (int): Maximum number of texts packed into one API call
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
+        temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
+        max_tokens (int): Maximum number of tokens in response
+        api_key (Optional[str]): OpenAI API key. If None, uses environment variable
+        return_inputs (bool): Echo each input text back in its result row. Off by
+                              default to avoid duplicating the input corpus;
+                              rows map back to inputs by position
+
+    Returns:
+        List[Dict[str, Any]]: One classification result per input text, in input order
+
+    Raises:
+        ValueError: If required parameters are missing
+    """
+
+    # Validate inputs
+    if not texts_to_classify:
+        raise ValueError("texts_to_classify cannot be empty")
+
+    if not classification_categories:
+        raise ValueError("classification_categories cannot be empty")
+
+    # Get API key
+    api_key = api_key or default_api_key()
+    if not api_key:
+        raise ValueError(
+            "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter"
+        )
+
+    # Reuse the shared client so requests reuse pooled connections
+    client = get_client(api_key)
+
+    # The static instructions (and category list) are shared by every batch
+    system_prompt = _batch_system_prompt(tuple(classification_categories))
+
+    all_results: List[Dict[str, Any]] = []
+
+    for start in range(0, len(texts_to_classify), batch_size):
+        chunk = texts_to_classify[start : start + batch_size]
+
+        # Number the items so results can be zipped back to inputs by position
+        items_text = "\n".join(f"{i + 1}. {text}" for i, text in enumerate(chunk))
+        user_message = f"Classify each of the following texts:\n\n{items_text}"
+
+        try:
+            # Make one API call for the whole chunk (with backoff retries)
+            response = create_chat_completion(
+                client,
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=["\n\n\n"],
+                response_format=_batch_classification_response_format(
+                    tuple(classification_categories)
+                ),
+            )
+
+            # Parse the response (schema-valid by construction)
+            response_content = response.choices[0].message.content
+            parsed = orjson.loads(response_content)
+            results_by_id = {
+                entry.get("id"): entry for entry in parsed.get("results", [])
+            }
+
+            for i, text in enumerate(chunk):
+                entry = results_by_id.get(i + 1)
+                if entry is None:
+                    # The model dropped or misnumbered this item; surface it
+                    # as an error row rather than a bare metadata dict
+                    entry = {"error": f"missing result for item {start + i + 1}"}
+                else:
+                    # The model's id is chunk-local; rewrite it with the
+                    # global position so it stays unique across chunks
+                    entry["id"] = start + i + 1
+                    entry["model_used"] = model
+                if return_inputs:
+                    entry["input_text"] = text
+                all_results.append(entry)
+
+        except openai.OpenAIError as e:
+            for text in chunk:
+                entry = {"error": f"OpenAI API error: {str(e)}"}
+                if return_inputs:
+                    entry["input_text"] = text
+                all_results.append(entry)
+
+        except Exception as e:
+            for text in chunk:
+                entry = {"error": f"Unexpected error: {str(e)}"}
+                if return_inputs:
+                    entry["input_text"] = text
+                all_results.append(entry)
+
+    return all_results
 
 
 def classify_text_simple(
@@ -172,7 +520,7 @@ if __name__ == "__main__":
     try:
         result = classify_text_simple(sample_text, categories)
         print("Result:")
-        print(json.dumps(result, indent=2))
+        print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
     except Exception as e:
         print(f"Error: {e}")
         print("Make sure to set your OPENAI_API_KEY environment variable")
@@ -203,7 +551,7 @@ Focus on the primary issue being described. If multiple issues are mentioned, ch
             system_prompt=custom_prompt,
         )
         print("Result:")
-        print(json.dumps(result2, indent=2))
+        print(orjson.dumps(result2, option=orjson.OPT_INDENT_2).decode())
     except Exception as e:
         print(f"Error: {e}")
         print("Make sure to set your OPENAI_API_KEY environment variable")
@@ -0,0 +1,93 @@
+"""Multi-pattern label matching for post-processing model output.
+
+With strict structured outputs the API can only return allowed labels,
+but free-text sources (older json_object responses, batch exports,
+gazetteer scans over raw documents) still need validation against the
+known category or entity vocabularies. Compiling all labels into one
+alternation pattern matches every label in a single pass over the text
+instead of N substring searches, and the compiled pattern is memoized
+per vocabulary.
+"""
+
+import functools
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+@functools.lru_cache(maxsize=32)
+def build_matcher(labels: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Compile (and memoize) a single case-insensitive pattern matching any label.
+
+    Longer labels are tried first so overlapping vocabularies ("IT Support"
+    vs "IT") match the most specific entry.
+
+    Args:
+        labels (Tuple[str, ...]): The label vocabulary
+
+    Returns:
+        re.Pattern[str]: Compiled alternation over all labels
+    """
+    if not labels:
+        raise ValueError("labels cannot be empty")
+
+    ordered = sorted(labels, key=len, reverse=True)
+    pattern = "|".join(re.escape(label) for label in ordered)
+    return re.compile(pattern, re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=32)
+def _canonical_lookup(labels: Tuple[str, ...]) -> Dict[str, str]:
+    """Map lowercased label text back to its canonical spelling."""
+    return {label.lower(): label for label in labels}
+
+
+def canonicalize_label(text: str, labels: Tuple[str, ...]) -> Optional[str]:
+    """
+    Resolve free-text model output to a canonical label, or None if no label
+    appears in the text.
+
+    An exact (case-insensitive) match wins; otherwise the first label found
+    anywhere in the text is returned, which handles outputs like
+    "The category is Audio Electronics.".
+
+    Args:
+        text (str): Free-text output to canonicalize
+        labels (Tuple[str, ...]): The allowed label vocabulary
+
+    Returns:
+        Optional[str]: The canonical label, or None
+    """
+    lookup = _canonical_lookup(labels)
+
+    exact = lookup.get(text.strip().lower())
+    if exact is not None:
+        return exact
+
+    match = build_matcher(labels).search(text)
+    if match is not None:
+        return lookup[match.group(0).lower()]
+
+    return None
+
+
+def scan_labels(text: str, labels: Tuple[str, ...]) -> List[Tuple[str, int]]:
+    """
+    Find every label occurrence in a document in one pass.
+
+    Useful as a gazetteer scan: compile all known entity example strings once
+    and locate them across a corpus without per-label substring searches.
+
+    Args:
+        text (str): The document to scan
+        labels (Tuple[str, ...]): The label vocabulary
+
+    Returns:
+        List[Tuple[str, int]]: (canonical_label, start_offset) per occurrence,
+                               in document order
+    """
+    lookup = _canonical_lookup(labels)
+    return [
+        (lookup[match.group(0).lower()], match.start())
+        for match in build_matcher(labels).finditer(text)
+    ]
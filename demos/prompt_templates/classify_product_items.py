@@ -1,13 +1,22 @@
 """python -m demos.prompt_templates.classify_product_items"""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from dataclasses import dataclass
-import json
-import os
+import functools
+import orjson
 from typing import Dict, Any, Optional, List
 import openai
-from openai import OpenAI
-from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from demos._cache import cached_chat_completion
+from demos._client import (
+    acreate_chat_completion,
+    create_chat_completion,
+    default_api_key,
+    get_async_client,
+    get_client,
+)
 
 
 @dataclass
@@ -55,32 +64,134 @@ PRODUCT_CATEGORIES = {
     ),
 }
 
+# Precomputed once at import; PRODUCT_CATEGORIES never changes at runtime, so
+# per-call string assembly for the static portion of the prompt is wasted work
+_CATEGORIES_TEXT = "\n".join(
+    f"- {category}: {product_category.category_name} - {product_category.category_description}"
+    for category, product_category in PRODUCT_CATEGORIES.items()
+)
+_CATEGORY_KEYS = tuple(PRODUCT_CATEGORIES.keys())
+
+# Strict response schemas: the enum constraint forces the model to pick an
+# allowed category, and strict mode guarantees schema-valid JSON server-side,
+# so parsing the response can never fail
+_PRODUCT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ProductClassification",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "required": [
+                "product_item_name",
+                "product_description",
+                "predicted_category",
+                "predicted_category_description",
+            ],
+            "properties": {
+                "product_item_name": {"type": "string"},
+                "product_description": {"type": "string"},
+                "predicted_category": {
+                    "type": "string",
+                    "enum": list(_CATEGORY_KEYS),
+                },
+                "predicted_category_description": {"type": "string"},
+            },
+            "additionalProperties": False,
+        },
+    },
+}
+
+_PRODUCT_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ProductClassificationBatch",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": [
+                            "id",
+                            "product_item_name",
+                            "predicted_category",
+                            "predicted_category_description",
+                        ],
+                        "properties": {
+                            "id": {"type": "integer"},
+                            "product_item_name": {"type": "string"},
+                            "predicted_category": {
+                                "type": "string",
+                                "enum": list(_CATEGORY_KEYS),
+                            },
+                            "predicted_category_description": {"type": "string"},
+                        },
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "additionalProperties": False,
+        },
+    },
+}
+
+# The invariant instructions live in the system message and the variable
+# product text in a short user message, so provider prompt caching can reuse
+# the static prefix (and its KV state) across calls
 CLASSIFY_PRODUCT_ITEMS_PROMPT = """
-You are a product classification expert. You are given a list of product items and you need to classify them into the appropriate category.
+You are a product classification expert. You are given a product item and you need to classify it into the appropriate category.
 If the product item is not classified into any other category, classify it into the "unclassified" category.
 
 Return the classification in the following JSON format:
 {{"product_item_name": "product_item_name", "product_description": "product_description", "predicted_category": "category_name", "predicted_category_description": "category_description"}}
 
-The product item name to classify is:
+The possible classification categories are:
+{categories}
+"""
+
+CLASSIFY_PRODUCT_ITEMS_USER_PROMPT = """The product item name to classify is:
 {product_item_name}
 
 The product description (if available) to classify is:
 {product_description}
+"""
+
+CLASSIFY_PRODUCT_ITEMS_BATCH_PROMPT = """
+You are a product classification expert. You are given a numbered list of product items and you need to classify each of them into the appropriate category.
+If a product item is not classified into any other category, classify it into the "unclassified" category.
+
+Return the classifications in the following JSON format, with one entry per input item and "id" matching the item number:
+{{"results": [{{"id": 1, "product_item_name": "product_item_name", "predicted_category": "category_name", "predicted_category_description": "category_description"}}]}}
 
 The possible classification categories are:
 {categories}
 """
 
+CLASSIFY_PRODUCT_ITEMS_BATCH_USER_PROMPT = """The product items to classify are:
+{product_items}
+"""
+
+# Fully-formatted system prompts, computed once at import
+_SYSTEM_PROMPT = CLASSIFY_PRODUCT_ITEMS_PROMPT.format(categories=_CATEGORIES_TEXT)
+_BATCH_SYSTEM_PROMPT = CLASSIFY_PRODUCT_ITEMS_BATCH_PROMPT.format(
+    categories=_CATEGORIES_TEXT
+)
+
 
 def generate_product_classification_text(
     product_item_name: str,
     product_description: str | None = None,
     prompt_template: str = CLASSIFY_PRODUCT_ITEMS_PROMPT,
-    model: str = "gpt-3.5-turbo",
+    model: str = "gpt-4o-mini",
     temperature: float = 0.1,
-    max_tokens: int = 2000,
+    max_tokens: int = 400,
     api_key: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    return_inputs: bool = False,
 ) -> Dict[str, Any]:
     """
     Generate text for product classification using the prompt template and categories.
@@ -88,105 +199,401 @@ def generate_product_classification_text(
     Args:
         product_items (List[str]): List of product items to classify
         prompt_template (str): The prompt template to use (defaults to CLASSIFY_PRODUCT_ITEMS_PROMPT)
-        model (str): OpenAI model to use (default: "gpt-3.5-turbo")
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
         temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
         max_tokens (int): Maximum number of tokens in response
         api_key (Optional[str]): OpenAI API key. If None, uses environment variable
+        use_cache (Optional[bool]): Cache responses for repeat prompts. Defaults to
+                                    caching only when temperature == 0
+        return_inputs (bool): Echo the item name, description, and category list
+                              back in the result. Off by default so batch runs
+                              do not duplicate their inputs in memory
 
     Returns:
         Dict[str, Any]: Response with generated classification text and metadata
     """
 
     # Validate inputs
-    if not product_items:
-        raise ValueError("product_items cannot be empty")
+    if not product_item_name:
+        raise ValueError("product_item_name cannot be empty")
 
     # Get API key
-    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    api_key = api_key or default_api_key()
     if not api_key:
         raise ValueError(
             "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter"
         )
 
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    # Reuse the shared client so requests reuse pooled connections
+    client = get_client(api_key)
 
-    # Prepare categories for the template
-    categories_text = "\n".join(
-        [
-            f"- {category}: {product_category.category_name} - {product_category.category_description}"
-            for category, product_category in PRODUCT_CATEGORIES.items()
-        ]
+    # Static instructions go in the system message so the provider can serve
+    # the shared prefix from its prompt cache; only the item text varies
+    system_prompt = (
+        _SYSTEM_PROMPT
+        if prompt_template is CLASSIFY_PRODUCT_ITEMS_PROMPT
+        else prompt_template.format(categories=_CATEGORIES_TEXT)
     )
-
-    # Prepare product items list
-    product_items_text = "\n".join([f"- {item}" for item in product_items])
-
-    # Format the prompt template
-    formatted_prompt = prompt_template.format(
+    user_message = CLASSIFY_PRODUCT_ITEMS_USER_PROMPT.format(
         product_item_name=product_item_name,
         product_description=product_description,
-        categories=categories_text,
     )
 
     try:
-        # Make API call
-        response = client.chat.completions.create(
+        # Make API call (served from the LRU cache on repeat prompts)
+        response = cached_chat_completion(
+            client,
             model=model,
-            messages=[{"role": "user", "content": formatted_prompt}],
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ],
             temperature=temperature,
+            use_cache=use_cache,
             max_tokens=max_tokens,
-            response_format={"type": "json_object"},
+            stop=["\n\n\n"],
+            response_format=_PRODUCT_RESPONSE_FORMAT,
         )
 
         # Extract response content
         response_content = response.choices[0].message.content
 
-        # Parse JSON response
+        # Parse JSON response (schema-valid by construction)
+        parsed_json = orjson.loads(response_content)
+        result = {
+            "parsed_json": parsed_json,
+            "model_used": model,
+            "tokens_used": response.usage.total_tokens if response.usage else None,
+        }
+
+    except openai.OpenAIError as e:
+        result = {"error": f"OpenAI API error: {str(e)}"}
+
+    except Exception as e:
+        result = {"error": f"Unexpected error: {str(e)}"}
+
+    if return_inputs:
+        result["product_item_name"] = product_item_name
+        result["product_description"] = product_description
+        result["categories_used"] = _CATEGORY_KEYS
+    return result
+
+
+def classify_product_items_batch(
+    product_items: List[str],
+    batch_size: int = 20,
+    prompt_template: str = CLASSIFY_PRODUCT_ITEMS_BATCH_PROMPT,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 2000,
+    api_key: Optional[str] = None,
+    return_inputs: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Classify many product items with one API call per batch instead of one call per item.
+
+    The category list is sent once per batch, so the per-item token cost drops
+    roughly in proportion to batch_size.
+
+    Args:
+        product_items (List[str]): List of product item names to classify
+        batch_size (int): Maximum number of items packed into one API call
+        prompt_template (str): The prompt template to use (defaults to CLASSIFY_PRODUCT_ITEMS_BATCH_PROMPT)
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
+        temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
+        max_tokens (int): Maximum number of tokens in response
+        api_key (Optional[str]): OpenAI API key. If None, uses environment variable
+        return_inputs (bool): Echo each item name back in its result row. Off by
+                              default; rows map back to inputs by position
+
+    Returns:
+        List[Dict[str, Any]]: One classification result per product item, in input order
+    """
+
+    # Validate inputs
+    if not product_items:
+        raise ValueError("product_items cannot be empty")
+
+    # Get API key
+    api_key = api_key or default_api_key()
+    if not api_key:
+        raise ValueError(
+            "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter"
+        )
+
+    # Reuse the shared client so requests reuse pooled connections
+    client = get_client(api_key)
+
+    all_results: List[Dict[str, Any]] = []
+
+    for start in range(0, len(product_items), batch_size):
+        chunk = product_items[start : start + batch_size]
+
+        # Number the items so results can be zipped back to inputs by position
+        product_items_text = "\n".join(
+            f"{i + 1}. {item}" for i, item in enumerate(chunk)
+        )
+
+        system_prompt = (
+            _BATCH_SYSTEM_PROMPT
+            if prompt_template is CLASSIFY_PRODUCT_ITEMS_BATCH_PROMPT
+            else prompt_template.format(categories=_CATEGORIES_TEXT)
+        )
+        user_message = CLASSIFY_PRODUCT_ITEMS_BATCH_USER_PROMPT.format(
+            product_items=product_items_text
+        )
+
         try:
-            parsed_json = json.loads(response_content)
-            result = {
-                "parsed_json": parsed_json,
-                "product_item_name": product_item_name,
-                "product_description": product_description,
-                "categories_used": list(PRODUCT_CATEGORIES.keys()),
-                "model_used": model,
-                "tokens_used": response.usage.total_tokens if response.usage else None,
-            }
-        except json.JSONDecodeError as e:
-            result = {
-                "generated_text": response_content,
-                "json_parse_error": str(e),
-                "product_item_name": product_item_name,
-                "product_description": product_description,
-                "categories_used": list(PRODUCT_CATEGORIES.keys()),
-                "model_used": model,
-                "tokens_used": response.usage.total_tokens if response.usage else None,
+            # Make one API call for the whole chunk (with backoff retries)
+            response = create_chat_completion(
+                client,
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=["\n\n\n"],
+                response_format=_PRODUCT_BATCH_RESPONSE_FORMAT,
+            )
+
+            response_content = response.choices[0].message.content
+
+            # Parse the response (schema-valid by construction)
+            parsed_json = orjson.loads(response_content)
+            results_by_id = {
+                entry.get("id"): entry
+                for entry in parsed_json.get("results", [])
             }
 
-        return result
+            for i, item in enumerate(chunk):
+                entry = results_by_id.get(i + 1)
+                if entry is None:
+                    # The model dropped or misnumbered this item; surface it
+                    # as an error row rather than a bare metadata dict
+                    entry = {"error": f"missing result for item {start + i + 1}"}
+                else:
+                    # The model's id is chunk-local; rewrite it with the
+                    # global position so it stays unique across chunks
+                    entry["id"] = start + i + 1
+                    entry["model_used"] = model
+                    if return_inputs:
+                        entry["categories_used"] = _CATEGORY_KEYS
+                if return_inputs:
+                    entry["product_item_name"] = item
+                all_results.append(entry)
 
-    except openai.OpenAIError as e:
-        return {
-            "error": f"OpenAI API error: {str(e)}",
-            "product_item_name": product_item_name,
-            "product_description": product_description,
-            "categories_used": list(PRODUCT_CATEGORIES.keys()),
+        except openai.OpenAIError as e:
+            for item in chunk:
+                entry = {"error": f"OpenAI API error: {str(e)}"}
+                if return_inputs:
+                    entry["product_item_name"] = item
+                all_results.append(entry)
+
+        except Exception as e:
+            for item in chunk:
+                entry = {"error": f"Unexpected error: {str(e)}"}
+                if return_inputs:
+                    entry["product_item_name"] = item
+                all_results.append(entry)
+
+    return all_results
+
+
+async def aclassify_product_item(
+    product_item_name: str,
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    product_description: str | None = None,
+    prompt_template: str = CLASSIFY_PRODUCT_ITEMS_PROMPT,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 400,
+    return_inputs: bool = False,
+) -> Dict[str, Any]:
+    """
+    Classify a single product item using a shared AsyncOpenAI client.
+
+    Args:
+        product_item_name (str): The product item name to classify
+        client (AsyncOpenAI): Shared async OpenAI client
+        semaphore (asyncio.Semaphore): Caps the number of in-flight requests
+        product_description (str | None): Optional product description
+        prompt_template (str): The prompt template to use (defaults to CLASSIFY_PRODUCT_ITEMS_PROMPT)
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
+        temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
+        max_tokens (int): Maximum number of tokens in response
+        return_inputs (bool): Echo the item name, description, and category list
+                              back in the result
+
+    Returns:
+        Dict[str, Any]: Response with generated classification text and metadata
+    """
+
+    system_prompt = (
+        _SYSTEM_PROMPT
+        if prompt_template is CLASSIFY_PRODUCT_ITEMS_PROMPT
+        else prompt_template.format(categories=_CATEGORIES_TEXT)
+    )
+    user_message = CLASSIFY_PRODUCT_ITEMS_USER_PROMPT.format(
+        product_item_name=product_item_name,
+        product_description=product_description,
+    )
+
+    try:
+        # The semaphore caps concurrency so a burst of tasks stays under rate limits
+        async with semaphore:
+            response = await acreate_chat_completion(
+                client,
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=["\n\n\n"],
+                response_format=_PRODUCT_RESPONSE_FORMAT,
+            )
+
+        response_content = response.choices[0].message.content
+
+        # Parse JSON response (schema-valid by construction)
+        parsed_json = orjson.loads(response_content)
+        result = {
+            "parsed_json": parsed_json,
+            "model_used": model,
+            "tokens_used": response.usage.total_tokens if response.usage else None,
         }
 
+    except openai.OpenAIError as e:
+        result = {"error": f"OpenAI API error: {str(e)}"}
+
     except Exception as e:
-        return {
-            "error": f"Unexpected error: {str(e)}",
-            "product_item_name": product_item_name,
-            "product_description": product_description,
-            "categories_used": list(PRODUCT_CATEGORIES.keys()),
-        }
+        result = {"error": f"Unexpected error: {str(e)}"}
+
+    if return_inputs:
+        result["product_item_name"] = product_item_name
+        result["product_description"] = product_description
+        result["categories_used"] = _CATEGORY_KEYS
+    return result
+
+
+async def classify_product_items_async(
+    product_items: List[str],
+    max_concurrency: int = 32,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 400,
+    api_key: Optional[str] = None,
+    return_inputs: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Classify many product items concurrently with asyncio.
+
+    The workload is I/O-bound (network round trips dominate), so issuing the
+    requests concurrently collapses total latency from N x per-call latency to
+    roughly the slowest single call.
+
+    Args:
+        product_items (List[str]): List of product item names to classify
+        max_concurrency (int): Maximum number of in-flight API requests
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
+        temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
+        max_tokens (int): Maximum number of tokens in response
+        api_key (Optional[str]): OpenAI API key. If None, uses environment variable
+        return_inputs (bool): Echo each item name back in its result. Off by
+                              default; results map back to inputs by position
+
+    Returns:
+        List[Dict[str, Any]]: One classification result per product item, in input order
+    """
+
+    # Validate inputs
+    if not product_items:
+        raise ValueError("product_items cannot be empty")
+
+    # Get API key
+    api_key = api_key or default_api_key()
+    if not api_key:
+        raise ValueError(
+            "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter"
+        )
+
+    client = get_async_client(api_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    return list(
+        await asyncio.gather(
+            *(
+                aclassify_product_item(
+                    product_item_name=item,
+                    client=client,
+                    semaphore=semaphore,
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    return_inputs=return_inputs,
+                )
+                for item in product_items
+            )
+        )
+    )
+
+
+def classify_product_items_threaded(
+    product_items: List[str],
+    max_parallel_requests: int = 32,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 400,
+    api_key: Optional[str] = None,
+    return_inputs: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Classify many product items concurrently from synchronous code.
+
+    A bounded ThreadPoolExecutor issues the per-item calls in parallel for
+    callers who cannot adopt the asyncio path. The default pool of 32 is
+    sized for I/O-bound API calls — Python's cpu_count()+4 default would cap
+    throughput far below what the network and rate limits allow. All threads
+    share the pooled client, so no per-thread handshakes are paid.
+
+    Args:
+        product_items (List[str]): List of product item names to classify
+        max_parallel_requests (int): Thread pool size; tune to your RPM limit
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
+        temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
+        max_tokens (int): Maximum number of tokens in response
+        api_key (Optional[str]): OpenAI API key. If None, uses environment variable
+        return_inputs (bool): Echo each item name back in its result. Off by
+                              default; results map back to inputs by position
+
+    Returns:
+        List[Dict[str, Any]]: One classification result per product item, in input order
+    """
+
+    # Validate inputs
+    if not product_items:
+        raise ValueError("product_items cannot be empty")
+
+    classify = functools.partial(
+        generate_product_classification_text,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        api_key=api_key,
+        return_inputs=return_inputs,
+    )
+
+    with ThreadPoolExecutor(max_workers=max_parallel_requests) as executor:
+        return list(executor.map(classify, product_items))
 
 
 # Example usage
 if __name__ == "__main__":
-    load_dotenv()
-    # Example 1: Product classification using the template
+    # Example 1: Product classification using the batch template (one API call)
     product_items = [
         "iPhone 15 Pro",
         "Sony WH-1000XM5 headphones",
@@ -196,14 +603,25 @@ if __name__ == "__main__":
         "childrens play set",
     ]
 
-    for j, product_item in enumerate(product_items):
-        print(f"Example {j}: Product classification using template")
-        print(f"Product item: {product_item}")
-        try:
-            result = generate_product_classification_text(product_item)
+    print("Example 1: Batched product classification using template")
+    try:
+        results = classify_product_items_batch(product_items)
+        for j, result in enumerate(results):
+            print(f"Product item {j}: {product_items[j]}")
             print("Result:")
-            print(json.dumps(result, indent=2))
-        except Exception as e:
-            print(f"Error: {e}")
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+            print("\n" + "=" * 50 + "\n")
+    except Exception as e:
+        print(f"Error: {e}")
 
-        print("\n" + "=" * 50 + "\n")
+    # Example 2: Concurrent per-item classification with asyncio
+    print("Example 2: Concurrent product classification with asyncio")
+    try:
+        results = asyncio.run(classify_product_items_async(product_items))
+        for j, result in enumerate(results):
+            print(f"Product item {j}: {product_items[j]}")
+            print("Result:")
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+            print("\n" + "=" * 50 + "\n")
+    except Exception as e:
+        print(f"Error: {e}")
@@ -1,10 +1,19 @@
+import asyncio
 from dataclasses import dataclass
-import json
-import os
-from typing import Dict, Any, Optional, List
+import functools
+import orjson
+from typing import Dict, Any, Optional, List, Tuple
 import openai
-from openai import OpenAI
-from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from demos._cache import cached_chat_completion
+from demos._tokens import fit_text_to_context
+from demos._client import (
+    acreate_chat_completion,
+    create_chat_completion,
+    default_api_key,
+    get_async_client,
+    get_client,
+)
 
 
 @dataclass
@@ -63,19 +72,137 @@ ENTITY_TYPES = {
 }
 
 
+def _format_entity_types(
+    entity_types: Dict[str, Entity], include_examples: bool
+) -> str:
+    """Format an entity type dict into the bulleted list used in the prompts."""
+    entity_types_formatted = []
+
+    for entity_key, entity in entity_types.items():
+        entity_description = f"- {entity.name}: {entity.description}"
+
+        if include_examples and entity.examples:
+            examples_str = ", ".join(entity.examples)
+            entity_description += f" Examples: {examples_str}"
+
+        entity_types_formatted.append(entity_description)
+
+    return "\n".join(entity_types_formatted)
+
+
+# Precomputed once at import for the default ENTITY_TYPES, so the common path
+# does no per-call string assembly
+_ENTITY_TYPES_TEXT_WITH_EX = _format_entity_types(ENTITY_TYPES, include_examples=True)
+_ENTITY_TYPES_TEXT_NO_EX = _format_entity_types(ENTITY_TYPES, include_examples=False)
+
+
+# The invariant instructions live in the system message and the variable text
+# in a short user message, so provider prompt caching can reuse the static
+# prefix (and its KV state) across calls
 ENTITY_EXTRACTION_PROMPT = """
 You are an entity extraction expert. You are given a text and you need to extract the entities from the text.
 
 Here is a list of the entity types you can extract:
 {entity_types}
 
-The text to extract entities from is:
-{text}
-
 Return the entities in the following JSON format:
 {{"entities": [{{"predicted_entity_type": "entity_type", "predicted_entity_name": "entity_name", "predicted_entity_description": "entity_description"}}]}}
 """
 
+ENTITY_EXTRACTION_USER_PROMPT = """The text to extract entities from is:
+{text}
+"""
+
+BATCH_ENTITY_EXTRACTION_PROMPT = """
+You are an entity extraction expert. You are given a numbered list of texts and you need to extract the entities from each text.
+
+Here is a list of the entity types you can extract:
+{entity_types}
+
+Return the entities in the following JSON format, with one entry per input text and "id" matching the text number:
+{{"results": [{{"id": 1, "entities": [{{"predicted_entity_type": "entity_type", "predicted_entity_name": "entity_name", "predicted_entity_description": "entity_description"}}]}}]}}
+"""
+
+BATCH_ENTITY_EXTRACTION_USER_PROMPT = """The texts to extract entities from are:
+{texts}
+"""
+
+
+@functools.lru_cache(maxsize=32)
+def _entity_response_format(entity_type_keys: Tuple[str, ...]) -> Dict[str, Any]:
+    """Build (and memoize) the strict response schema for an entity type set.
+
+    The enum constraint forces the model to emit only allowed entity types,
+    and strict mode guarantees schema-valid JSON server-side, so parsing the
+    response can never fail.
+    """
+    entity_schema = {
+        "type": "object",
+        "required": [
+            "predicted_entity_type",
+            "predicted_entity_name",
+            "predicted_entity_description",
+        ],
+        "properties": {
+            "predicted_entity_type": {
+                "type": "string",
+                "enum": list(entity_type_keys),
+            },
+            "predicted_entity_name": {"type": "string"},
+            "predicted_entity_description": {"type": "string"},
+        },
+        "additionalProperties": False,
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "EntityExtraction",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "required": ["entities"],
+                "properties": {
+                    "entities": {"type": "array", "items": entity_schema},
+                },
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def _batch_entity_response_format(entity_type_keys: Tuple[str, ...]) -> Dict[str, Any]:
+    """Build (and memoize) the strict response schema for batched entity extraction."""
+    entity_list_schema = _entity_response_format(entity_type_keys)["json_schema"][
+        "schema"
+    ]["properties"]["entities"]
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "EntityExtractionBatch",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "required": ["results"],
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["id", "entities"],
+                            "properties": {
+                                "id": {"type": "integer"},
+                                "entities": entity_list_schema,
+                            },
+                            "additionalProperties": False,
+                        },
+                    },
+                },
+                "additionalProperties": False,
+            },
+        },
+    }
+
 
 def assemble_ner_prompt(
     text: str,
@@ -110,40 +237,86 @@ def assemble_ner_prompt(
     if entity_types is None:
         entity_types = ENTITY_TYPES
 
-    # Format entity types for the prompt
-    entity_types_formatted = []
+    messages = assemble_ner_messages(
+        text=text,
+        entity_types=entity_types,
+        prompt_template=prompt_template,
+        include_examples=include_examples,
+        custom_instructions=custom_instructions,
+    )
 
-    for entity_key, entity in entity_types.items():
-        entity_description = f"- {entity.name}: {entity.description}"
+    return "\n\n".join(message["content"] for message in messages)
 
-        if include_examples and entity.examples:
-            examples_str = ", ".join(entity.examples)
-            entity_description += f" Examples: {examples_str}"
 
-        entity_types_formatted.append(entity_description)
+def assemble_ner_messages(
+    text: str,
+    entity_types: Optional[Dict[str, Entity]] = None,
+    prompt_template: str = ENTITY_EXTRACTION_PROMPT,
+    include_examples: bool = True,
+    custom_instructions: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """
+    Assemble the chat messages for Named Entity Recognition (NER) extraction.
+
+    The invariant instructions (entity types, examples, JSON format) go in the
+    system message and only the text to process in the user message, so the
+    static prefix stays byte-identical across calls and qualifies for provider
+    prompt caching.
+
+    Args:
+        text (str): The text to extract entities from
+        entity_types (Optional[Dict[str, Entity]]): Dictionary of entity types to extract.
+                                                   If None, uses default ENTITY_TYPES
+        prompt_template (str): The system prompt template to use (defaults to ENTITY_EXTRACTION_PROMPT)
+        include_examples (bool): Whether to include examples in the entity type descriptions
+        custom_instructions (Optional[str]): Additional custom instructions to append
+
+    Returns:
+        List[Dict[str, str]]: System and user messages ready for the chat API
+
+    Raises:
+        ValueError: If required parameters are missing
+    """
 
-    entity_types_text = "\n".join(entity_types_formatted)
+    # Validate inputs
+    if not text.strip():
+        raise ValueError("text cannot be empty")
 
-    # Format the prompt template
-    formatted_prompt = prompt_template.format(entity_types=entity_types_text, text=text)
+    # The default entity types use the precomputed text; only a custom dict
+    # pays for formatting
+    if entity_types is None or entity_types is ENTITY_TYPES:
+        entity_types_text = (
+            _ENTITY_TYPES_TEXT_WITH_EX if include_examples else _ENTITY_TYPES_TEXT_NO_EX
+        )
+    else:
+        entity_types_text = _format_entity_types(entity_types, include_examples)
 
-    # Add custom instructions if provided
+    # Format the system prompt template
+    system_prompt = prompt_template.format(entity_types=entity_types_text)
+
+    # Custom instructions are static per configuration, so they extend the
+    # cacheable system prefix rather than the user message
     if custom_instructions:
-        formatted_prompt += f"\n\nAdditional Instructions:\n{custom_instructions}"
+        system_prompt += f"\n\nAdditional Instructions:\n{custom_instructions}"
 
-    return formatted_prompt
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": ENTITY_EXTRACTION_USER_PROMPT.format(text=text)},
+    ]
 
 
 def extract_entities_with_openai(
     text: str,
     entity_types: Optional[Dict[str, Entity]] = None,
     prompt_template: str = ENTITY_EXTRACTION_PROMPT,
-    model: str = "gpt-3.5-turbo",
+    model: str = "gpt-4o-mini",
     temperature: float = 0.1,
-    max_tokens: int = 2000,
+    max_tokens: int = 800,
     api_key: Optional[str] = None,
     include_examples: bool = True,
     custom_instructions: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    return_inputs: bool = False,
 ) -> Dict[str, Any]:
     """
     Extract entities from text using OpenAI's API with the assembled NER prompt.
@@ -152,12 +325,17 @@ def extract_entities_with_openai(
         text (str): The text to extract entities from
         entity_types (Optional[Dict[str, Entity]]): Dictionary of entity types to extract
         prompt_template (str): The prompt template to use
-        model (str): OpenAI model to use (default: "gpt-3.5-turbo")
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
         temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
         max_tokens (int): Maximum number of tokens in response
         api_key (Optional[str]): OpenAI API key. If None, uses environment variable
         include_examples (bool): Whether to include examples in entity descriptions
         custom_instructions (Optional[str]): Additional custom instructions
+        use_cache (Optional[bool]): Cache responses for repeat prompts. Defaults to
+                                    caching only when temperature == 0
+        return_inputs (bool): Echo the input text and entity type list back in
+                              the result. Off by default so batch runs do not
+                              duplicate their inputs in memory
 
     Returns:
         Dict[str, Any]: Response with extracted entities and metadata
@@ -172,17 +350,17 @@ def extract_entities_with_openai(
         raise ValueError("text cannot be empty")
 
     # Get API key
-    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    api_key = api_key or default_api_key()
     if not api_key:
         raise ValueError(
             "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter"
         )
 
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    # Reuse the shared client so requests reuse pooled connections
+    client = get_client(api_key)
 
-    # Assemble the prompt
-    assembled_prompt = assemble_ner_prompt(
+    # Assemble the messages (static system prefix + variable user text)
+    messages = assemble_ner_messages(
         text=text,
         entity_types=entity_types,
         prompt_template=prompt_template,
@@ -190,61 +368,354 @@ def extract_entities_with_openai(
         custom_instructions=custom_instructions,
     )
 
+    # Count the prompt locally and truncate oversized inputs up front rather
+    # than paying a round trip for a context-length error
+    fitted_text, prompt_tokens = fit_text_to_context(
+        text,
+        messages[0]["content"] + ENTITY_EXTRACTION_USER_PROMPT,
+        model,
+        max_tokens,
+    )
+    if fitted_text != text:
+        messages[1]["content"] = ENTITY_EXTRACTION_USER_PROMPT.format(text=fitted_text)
+
     try:
-        # Make API call
-        response = client.chat.completions.create(
+        # Make API call (served from the LRU cache on repeat prompts)
+        response = cached_chat_completion(
+            client,
             model=model,
-            messages=[{"role": "user", "content": assembled_prompt}],
+            messages=messages,
             temperature=temperature,
+            use_cache=use_cache,
             max_tokens=max_tokens,
-            response_format={"type": "json_object"},
+            stop=["\n\n\n"],
+            response_format=_entity_response_format(
+                tuple(entity_types.keys()) if entity_types else tuple(ENTITY_TYPES.keys())
+            ),
         )
 
-        # Extract response content
+        # Extract and parse the response (schema-valid by construction)
         response_content = response.choices[0].message.content
+        parsed_json = orjson.loads(response_content)
+        result = {
+            "extracted_entities": parsed_json,
+            "model_used": model,
+            "prompt_tokens": prompt_tokens,
+            "tokens_used": response.usage.total_tokens if response.usage else None,
+        }
+
+    except openai.OpenAIError as e:
+        result = {"error": f"OpenAI API error: {str(e)}"}
+
+    except Exception as e:
+        result = {"error": f"Unexpected error: {str(e)}"}
+
+    if return_inputs:
+        result["input_text"] = text
+        result["entity_types_used"] = (
+            list(entity_types.keys()) if entity_types else list(ENTITY_TYPES.keys())
+        )
+    return result
+
+
+def extract_entities_batch(
+    texts: List[str],
+    entity_types: Optional[Dict[str, Entity]] = None,
+    prompt_template: str = BATCH_ENTITY_EXTRACTION_PROMPT,
+    batch_size: int = 20,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 2000,
+    api_key: Optional[str] = None,
+    include_examples: bool = True,
+    return_inputs: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Extract entities from many texts with one API call per batch instead of one call per text.
+
+    The entity type descriptions (and examples) are sent once per batch, so the
+    per-text token cost drops roughly in proportion to batch_size.
+
+    Args:
+        texts (List[str]): The texts to extract entities from
+        entity_types (Optional[Dict[str, Entity]]): Dictionary of entity types to extract
+        prompt_template (str): The prompt template to use (defaults to BATCH_ENTITY_EXTRACTION_PROMPT)
+        batch_size (int): Maximum number of texts packed into one API call
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
+        temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
+        max_tokens (int): Maximum number of tokens in response
+        api_key (Optional[str]): OpenAI API key. If None, uses environment variable
+        include_examples (bool): Whether to include examples in entity descriptions
+        return_inputs (bool): Echo each input text back in its result row. Off by
+                              default; rows map back to inputs by position
+
+    Returns:
+        List[Dict[str, Any]]: One extraction result per input text, in input order
+    """
+
+    # Validate inputs
+    if not texts:
+        raise ValueError("texts cannot be empty")
+
+    # Get API key
+    api_key = api_key or default_api_key()
+    if not api_key:
+        raise ValueError(
+            "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter"
+        )
+
+    # Reuse the shared client so requests reuse pooled connections
+    client = get_client(api_key)
+
+    # Use default entity types if none provided
+    if entity_types is None:
+        entity_types = ENTITY_TYPES
+
+    # Format entity types once (precomputed for the default set)
+    if entity_types is ENTITY_TYPES:
+        entity_types_text = (
+            _ENTITY_TYPES_TEXT_WITH_EX if include_examples else _ENTITY_TYPES_TEXT_NO_EX
+        )
+    else:
+        entity_types_text = _format_entity_types(entity_types, include_examples)
+
+    all_results: List[Dict[str, Any]] = []
+
+    for start in range(0, len(texts), batch_size):
+        chunk = texts[start : start + batch_size]
+
+        # Number the texts so results can be zipped back to inputs by position
+        texts_formatted = "\n\n".join(
+            f"{i + 1}. {text.strip()}" for i, text in enumerate(chunk)
+        )
+
+        system_prompt = prompt_template.format(entity_types=entity_types_text)
+        user_message = BATCH_ENTITY_EXTRACTION_USER_PROMPT.format(
+            texts=texts_formatted
+        )
 
-        # Parse JSON response
         try:
-            parsed_json = json.loads(response_content)
-            result = {
-                "extracted_entities": parsed_json,
-                "input_text": text,
-                "entity_types_used": list(entity_types.keys())
-                if entity_types
-                else list(ENTITY_TYPES.keys()),
-                "model_used": model,
-                "tokens_used": response.usage.total_tokens if response.usage else None,
-            }
-        except json.JSONDecodeError as e:
-            result = {
-                "error": "Failed to parse JSON response from OpenAI",
-                "raw_response": response_content,
-                "json_error": str(e),
-                "input_text": text,
-                "entity_types_used": list(entity_types.keys())
-                if entity_types
-                else list(ENTITY_TYPES.keys()),
+            # Make one API call for the whole chunk (with backoff retries)
+            response = create_chat_completion(
+                client,
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=["\n\n\n"],
+                response_format=_batch_entity_response_format(
+                    tuple(entity_types.keys())
+                ),
+            )
+
+            # Parse the response (schema-valid by construction)
+            response_content = response.choices[0].message.content
+            parsed_json = orjson.loads(response_content)
+            results_by_id = {
+                entry.get("id"): entry
+                for entry in parsed_json.get("results", [])
             }
 
-        return result
+            for i, text in enumerate(chunk):
+                entry = results_by_id.get(i + 1)
+                if entry is None:
+                    # The model dropped or misnumbered this text; surface it
+                    # as an error row rather than an empty entity list
+                    row = {"error": f"missing result for item {start + i + 1}"}
+                else:
+                    row = {
+                        "extracted_entities": {
+                            "entities": entry.get("entities", [])
+                        },
+                        "model_used": model,
+                    }
+                    if return_inputs:
+                        row["entity_types_used"] = list(entity_types.keys())
+                if return_inputs:
+                    row["input_text"] = text
+                all_results.append(row)
+
+        except openai.OpenAIError as e:
+            for text in chunk:
+                row = {"error": f"OpenAI API error: {str(e)}"}
+                if return_inputs:
+                    row["input_text"] = text
+                all_results.append(row)
 
-    except openai.OpenAIError as e:
-        return {
-            "error": f"OpenAI API error: {str(e)}",
-            "input_text": text,
-            "entity_types_used": list(entity_types.keys())
-            if entity_types
-            else list(ENTITY_TYPES.keys()),
+        except Exception as e:
+            for text in chunk:
+                row = {"error": f"Unexpected error: {str(e)}"}
+                if return_inputs:
+                    row["input_text"] = text
+                all_results.append(row)
+
+    return all_results
+
+
+async def aextract_entities(
+    text: str,
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    entity_types: Optional[Dict[str, Entity]] = None,
+    prompt_template: str = ENTITY_EXTRACTION_PROMPT,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 800,
+    include_examples: bool = True,
+    custom_instructions: Optional[str] = None,
+    return_inputs: bool = False,
+) -> Dict[str, Any]:
+    """
+    Extract entities from a single text using a shared AsyncOpenAI client.
+
+    Args:
+        text (str): The text to extract entities from
+        client (AsyncOpenAI): Shared async OpenAI client
+        semaphore (asyncio.Semaphore): Caps the number of in-flight requests
+        entity_types (Optional[Dict[str, Entity]]): Dictionary of entity types to extract
+        prompt_template (str): The prompt template to use
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
+        temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
+        max_tokens (int): Maximum number of tokens in response
+        include_examples (bool): Whether to include examples in entity descriptions
+        custom_instructions (Optional[str]): Additional custom instructions
+        return_inputs (bool): Echo the input text and entity type list back in
+                              the result
+
+    Returns:
+        Dict[str, Any]: Response with extracted entities and metadata
+    """
+
+    # Assemble the messages (static system prefix + variable user text)
+    messages = assemble_ner_messages(
+        text=text,
+        entity_types=entity_types,
+        prompt_template=prompt_template,
+        include_examples=include_examples,
+        custom_instructions=custom_instructions,
+    )
+
+    # Count the prompt locally and truncate oversized inputs up front rather
+    # than paying a round trip for a context-length error
+    fitted_text, prompt_tokens = fit_text_to_context(
+        text,
+        messages[0]["content"] + ENTITY_EXTRACTION_USER_PROMPT,
+        model,
+        max_tokens,
+    )
+    if fitted_text != text:
+        messages[1]["content"] = ENTITY_EXTRACTION_USER_PROMPT.format(text=fitted_text)
+
+    try:
+        # The semaphore caps concurrency so a burst of tasks stays under rate limits
+        async with semaphore:
+            response = await acreate_chat_completion(
+                client,
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=["\n\n\n"],
+                response_format=_entity_response_format(
+                    tuple(entity_types.keys())
+                    if entity_types
+                    else tuple(ENTITY_TYPES.keys())
+                ),
+            )
+
+        # Parse the response (schema-valid by construction)
+        response_content = response.choices[0].message.content
+        parsed_json = orjson.loads(response_content)
+        result = {
+            "extracted_entities": parsed_json,
+            "model_used": model,
+            "prompt_tokens": prompt_tokens,
+            "tokens_used": response.usage.total_tokens if response.usage else None,
         }
 
+    except openai.OpenAIError as e:
+        result = {"error": f"OpenAI API error: {str(e)}"}
+
     except Exception as e:
-        return {
-            "error": f"Unexpected error: {str(e)}",
-            "input_text": text,
-            "entity_types_used": list(entity_types.keys())
-            if entity_types
-            else list(ENTITY_TYPES.keys()),
-        }
+        result = {"error": f"Unexpected error: {str(e)}"}
+
+    if return_inputs:
+        result["input_text"] = text
+        result["entity_types_used"] = (
+            list(entity_types.keys()) if entity_types else list(ENTITY_TYPES.keys())
+        )
+    return result
+
+
+async def extract_entities_async(
+    texts: List[str],
+    entity_types: Optional[Dict[str, Entity]] = None,
+    max_concurrency: int = 32,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 800,
+    api_key: Optional[str] = None,
+    include_examples: bool = True,
+    return_inputs: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Extract entities from many texts concurrently with asyncio.
+
+    The workload is I/O-bound (network round trips dominate), so issuing the
+    requests concurrently collapses total latency from N x per-call latency to
+    roughly the slowest single call.
+
+    Args:
+        texts (List[str]): The texts to extract entities from
+        entity_types (Optional[Dict[str, Entity]]): Dictionary of entity types to extract
+        max_concurrency (int): Maximum number of in-flight API requests
+        model (str): OpenAI model to use (default: "gpt-4o-mini")
+        temperature (float): Controls randomness (0.0 = deterministic, 1.0 = very random)
+        max_tokens (int): Maximum number of tokens in response
+        api_key (Optional[str]): OpenAI API key. If None, uses environment variable
+        include_examples (bool): Whether to include examples in entity descriptions
+        return_inputs (bool): Echo each input text back in its result. Off by
+                              default; results map back to inputs by position
+
+    Returns:
+        List[Dict[str, Any]]: One extraction result per input text, in input order
+    """
+
+    # Validate inputs
+    if not texts:
+        raise ValueError("texts cannot be empty")
+
+    # Get API key
+    api_key = api_key or default_api_key()
+    if not api_key:
+        raise ValueError(
+            "OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter"
+        )
+
+    client = get_async_client(api_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    return list(
+        await asyncio.gather(
+            *(
+                aextract_entities(
+                    text=text,
+                    client=client,
+                    semaphore=semaphore,
+                    entity_types=entity_types,
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    include_examples=include_examples,
+                    return_inputs=return_inputs,
+                )
+                for text in texts
+            )
+        )
+    )
 
 
 def extract_entities_simple(text: str, api_key: Optional[str] = None) -> Dict[str, Any]:
@@ -263,7 +734,6 @@ def extract_entities_simple(text: str, api_key: Optional[str] = None) -> Dict[st
 
 # Example usage
 if __name__ == "__main__":
-    load_dotenv()
 
     # Example 1: Simple entity extraction
     sample_texts = [
@@ -286,16 +756,27 @@ OpenAI will be a so-called “off-taker” in the project, meaning it will effec
         """,
     ]
 
-    for j, text in enumerate(sample_texts):
-        print(f"Example {j}: Simple entity extraction")
-        print(f"Text: {text}")
-
-        try:
-            result = extract_entities_simple(text)
+    print("Example 1: Batched entity extraction (one API call)")
+    try:
+        results = extract_entities_batch(sample_texts)
+        for j, result in enumerate(results):
+            print(f"Text {j}: {sample_texts[j]}")
             print("Result:")
-            print(json.dumps(result, indent=2))
-        except Exception as e:
-            print(f"Error: {e}")
-            print("Make sure to set your OPENAI_API_KEY environment variable")
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+            print("\n" + "=" * 50 + "\n")
+    except Exception as e:
+        print(f"Error: {e}")
+        print("Make sure to set your OPENAI_API_KEY environment variable")
 
-        print("\n" + "=" * 50 + "\n")
+    # Example 2: Concurrent per-text extraction with asyncio
+    print("Example 2: Concurrent entity extraction with asyncio")
+    try:
+        results = asyncio.run(extract_entities_async(sample_texts))
+        for j, result in enumerate(results):
+            print(f"Text {j}: {sample_texts[j]}")
+            print("Result:")
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+            print("\n" + "=" * 50 + "\n")
+    except Exception as e:
+        print(f"Error: {e}")
+        print("Make sure to set your OPENAI_API_KEY environment variable")
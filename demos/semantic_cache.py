@@ -0,0 +1,108 @@
+"""Embedding-gated semantic cache for near-duplicate queries.
+
+The exact hash cache in demos._cache only helps on byte-identical
+repeats. Demo and eval workloads are full of paraphrases ("I love this
+product" / "this product is great") that would classify identically, so
+this layer embeds the user-visible text with a local sentence
+transformer and serves a cached response when a prior query is close
+enough in cosine similarity. Use it as an L2 behind the exact cache:
+check exact first, then semantic, then call the API.
+
+Requires sentence-transformers and faiss-cpu; both are imported lazily
+so the rest of the demos work without them.
+"""
+
+from typing import Any, Optional
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Conservative default: at 0.93 cosine, paraphrases hit but texts that flip
+# the label (negations, different subjects) generally do not
+DEFAULT_SIMILARITY_THRESHOLD = 0.93
+
+
+class SemanticCache:
+    """
+    Cosine-nearest-neighbor cache over (text, response) pairs.
+
+    Texts are embedded with a local SentenceTransformer and indexed in a flat
+    FAISS inner-product index (embeddings are L2-normalized, so inner product
+    is cosine similarity). A lookup returns the stored response of the nearest
+    prior text when its similarity clears the threshold.
+
+    Args:
+        model_name (str): SentenceTransformer model to embed with
+        similarity_threshold (float): Minimum cosine similarity for a hit
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ):
+        # Lazy imports keep these heavyweight dependencies optional
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model_name)
+        self._index = faiss.IndexFlatIP(
+            self._model.get_sentence_embedding_dimension()
+        )
+        self._responses: list = []
+        self._exact: dict = {}
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.misses = 0
+
+    def _embed(self, text: str) -> Any:
+        """Embed one text as a normalized float32 row vector."""
+        return self._model.encode(
+            [text], normalize_embeddings=True, convert_to_numpy=True
+        )
+
+    def get(self, text: str) -> Optional[Any]:
+        """
+        Return the cached response for text, or None on a miss.
+
+        Byte-identical repeats hit the exact dict (L1) without paying for an
+        embedding; otherwise the nearest stored neighbor must clear the
+        similarity threshold.
+        """
+        if text in self._exact:
+            self.hits += 1
+            return self._exact[text]
+
+        if self._index.ntotal > 0:
+            scores, indices = self._index.search(self._embed(text), 1)
+            if scores[0, 0] >= self.similarity_threshold:
+                self.hits += 1
+                return self._responses[indices[0, 0]]
+
+        self.misses += 1
+        return None
+
+    def put(self, text: str, response: Any) -> None:
+        """Store a response under its source text."""
+        self._exact[text] = response
+        self._index.add(self._embed(text))
+        self._responses.append(response)
+
+    def get_or_call(self, text: str, call: Any) -> Any:
+        """
+        Return the cached response for text, calling call() and caching its
+        result on a miss.
+
+        Args:
+            text (str): The user-visible text keying the cache
+            call: Zero-argument callable producing the response on a miss
+
+        Returns:
+            The cached or freshly produced response
+        """
+        cached = self.get(text)
+        if cached is not None:
+            return cached
+
+        response = call()
+        self.put(text, response)
+        return response